@@ -0,0 +1,65 @@
+"""Run the benchmark suite: `python -m benchmarks [--output FILE] [--baseline FILE]`."""
+
+from pathlib import Path
+
+from click import ClickException
+from click import FloatRange
+from click import IntRange
+from click import Path as ClickPath
+from click import command
+from click import echo
+from click import option
+
+from benchmarks.suite import check_comparable
+from benchmarks.suite import compare_results
+from benchmarks.suite import load_results
+from benchmarks.suite import run_suite
+from benchmarks.suite import save_results
+
+
+@command()
+@option("--output", type=Path, default=None, help="Store results as JSON.")
+@option(
+    "--baseline",
+    type=ClickPath(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Compare results against previously stored JSON.",
+)
+@option("--tolerance", type=FloatRange(0, 1), default=0.1, help="Allowed throughput drop.", show_default=True)
+@option(
+    "--scale", type=FloatRange(min=0, min_open=True), default=1.0, help="Fixture size multiplier.", show_default=True
+)
+@option("--repeat", type=IntRange(min=1), default=3, help="Runs per benchmark (best is kept).", show_default=True)
+def run_benchmarks(output: Path | None, baseline: Path | None, tolerance: float, scale: float, repeat: int) -> None:
+    """Measure throughput of the generator, the directory scanner and the repository discovery."""
+    try:
+        baseline_results = load_results(baseline) if baseline else None
+        if baseline_results:
+            check_comparable(baseline_results, scale, repeat)
+    except ValueError as error:
+        raise ClickException(str(error)) from None
+
+    measurements = run_suite(scale, repeat)
+    for measurement in measurements:
+        line = f"{measurement.name:<40} {measurement.value:>14.2f} {measurement.unit}"
+        reference = baseline_results.measurements.get(measurement.name) if baseline_results else None
+        if reference and reference.value:
+            line += f" ({(measurement.value / reference.value - 1) * 100:+.1f}%)"
+        echo(line)
+
+    if output:
+        save_results(output, measurements, scale, repeat)
+        echo(f"Results saved to '{output}'.")
+
+    if not baseline_results:
+        return
+
+    regressions = compare_results(measurements, baseline_results, tolerance)
+    for current, reference in regressions:
+        echo(f"Regression: {current.name}: {current.value:.2f} < {reference.value:.2f} {current.unit}", err=True)
+    if regressions:
+        raise ClickException(f"{len(regressions)} benchmarks regressed by more than {tolerance:.0%}.")
+
+
+if __name__ == "__main__":
+    run_benchmarks()
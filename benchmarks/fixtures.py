@@ -0,0 +1,78 @@
+"""Synthetic directory trees for benchmarks."""
+
+from dataclasses import dataclass
+from pathlib import Path
+from random import Random
+
+from shell_tools.files.random import make_random_file
+
+FILE_SIZE = 256
+LINE_LENGTH = 64
+
+
+@dataclass(frozen=True)
+class TreeStats:
+    """Shape of a generated tree."""
+
+    root: Path
+    dirs: int
+    files: int
+    repositories: int
+
+
+def build_deep_tree(root: Path, depth: int = 100, breadth: int = 2) -> TreeStats:
+    """Build a chain of `depth` nested directories, each with `breadth` empty siblings and a file."""
+    dirs = files = 0
+    current = root
+    for level in range(depth):
+        current = current / f"level-{level}"
+        current.mkdir(parents=True)
+        dirs += 1
+        for index in range(breadth):
+            (current / f"empty-{index}").mkdir()
+            dirs += 1
+        make_random_file(current / "file.txt", FILE_SIZE, LINE_LENGTH)
+        files += 1
+
+    return TreeStats(root, dirs, files, 0)
+
+
+def build_wide_tree(root: Path, width: int = 2000) -> TreeStats:
+    """Build `width` sibling directories where every other one contains a file."""
+    files = 0
+    for index in range(width):
+        directory = root / f"dir-{index}"
+        directory.mkdir(parents=True)
+        if index % 2:
+            make_random_file(directory / "file.txt", FILE_SIZE, LINE_LENGTH)
+            files += 1
+
+    return TreeStats(root, width, files, 0)
+
+
+def build_mixed_tree(root: Path, dirs: int = 2000, repository_ratio: float = 0.1, seed: int = 42) -> TreeStats:
+    """
+    Build a randomly branching tree of `dirs` directories.
+
+    A `repository_ratio` share of the directories contains a `.git` directory, so repositories end up nested.
+    """
+    generator = Random(seed)
+    created = [root]
+    root.mkdir(parents=True, exist_ok=True)
+    files = repositories = 0
+    for index in range(dirs):
+        directory = generator.choice(created) / f"dir-{index}"
+        directory.mkdir()
+        created.append(directory)
+
+        if generator.random() < repository_ratio:
+            marker = directory / ".git"
+            marker.mkdir()
+            make_random_file(marker / "HEAD", FILE_SIZE, LINE_LENGTH)
+            repositories += 1
+            files += 1
+        elif generator.random() < 0.5:
+            make_random_file(directory / "file.txt", FILE_SIZE, LINE_LENGTH)
+            files += 1
+
+    return TreeStats(root, dirs + repositories, files, repositories)
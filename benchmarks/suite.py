@@ -0,0 +1,151 @@
+"""Throughput benchmarks for the generator, the directory scanner and the repository discovery."""
+
+from collections.abc import Callable
+from collections.abc import Iterator
+from dataclasses import asdict
+from dataclasses import dataclass
+from functools import partial
+from json import dumps as json_to_str
+from json import loads as json_from_str
+from pathlib import Path
+from platform import platform
+from platform import python_version
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any
+
+from benchmarks.fixtures import TreeStats
+from benchmarks.fixtures import build_deep_tree
+from benchmarks.fixtures import build_mixed_tree
+from benchmarks.fixtures import build_wide_tree
+from shell_tools.dirs.search import find_empty_dirs
+from shell_tools.files.random import make_random_file
+from shell_tools.git.misc import find_repositories
+
+LINE_LENGTHS = (16, 64, 256, 1024, 4096)
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """Best throughput observed for a single benchmark."""
+
+    name: str
+    value: float
+    unit: str
+    seconds: float
+
+
+def measure(name: str, unit: str, amount: float, action: Callable[[], Any], repeat: int) -> Measurement:
+    """Run `action` `repeat` times and report the best throughput of `amount` units per second."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        action()
+        best = min(best, perf_counter() - started)
+
+    return Measurement(name, amount / best if best else float("inf"), unit, best)
+
+
+def bench_make_random_file(root: Path, size: int, repeat: int) -> Iterator[Measurement]:
+    path = root / "random.txt"
+    for line_length in LINE_LENGTHS:
+        yield measure(
+            f"make_random_file[line_length={line_length}]",
+            "MB/s",
+            size / (1024 * 1024),
+            partial(make_random_file, path, size, line_length),
+            repeat,
+        )
+
+
+def bench_find_empty_dirs(trees: dict[str, TreeStats], repeat: int) -> Iterator[Measurement]:
+    for shape, tree in trees.items():
+        yield measure(f"find_empty_dirs[{shape}]", "dirs/s", tree.dirs, partial(find_empty_dirs, tree.root), repeat)
+
+
+def bench_find_repositories(tree: TreeStats, repeat: int) -> Iterator[Measurement]:
+    yield measure(
+        "find_repositories[mixed]",
+        "repos/s",
+        tree.repositories,
+        partial(find_repositories, tree.root, recursive=True),
+        repeat,
+    )
+
+
+def run_suite(scale: float = 1.0, repeat: int = 3) -> list[Measurement]:
+    """Build fixtures in a temporary directory and run every benchmark on them."""
+    with TemporaryDirectory() as dir_name:
+        root = Path(dir_name)
+        trees = {
+            "deep": build_deep_tree(root / "deep", depth=max(1, int(100 * scale))),
+            "wide": build_wide_tree(root / "wide", width=max(1, int(2000 * scale))),
+            "mixed": build_mixed_tree(root / "mixed", dirs=max(1, int(2000 * scale))),
+        }
+
+        measurements = list(bench_make_random_file(root, max(1024, int(4 * 1024 * 1024 * scale)), repeat))
+        measurements += bench_find_empty_dirs(trees, repeat)
+        measurements += bench_find_repositories(trees["mixed"], repeat)
+        return measurements
+
+
+@dataclass(frozen=True)
+class Results:
+    """Measurements of a suite run together with the settings they were taken with."""
+
+    scale: float
+    repeat: int
+    measurements: dict[str, Measurement]
+
+
+def save_results(path: Path, measurements: list[Measurement], scale: float, repeat: int) -> None:
+    """Store `measurements` and the run settings as JSON together with the environment description."""
+    document = {
+        "python": python_version(),
+        "platform": platform(),
+        "scale": scale,
+        "repeat": repeat,
+        "results": {measurement.name: asdict(measurement) for measurement in measurements},
+    }
+    path.write_text(json_to_str(document, indent=4) + "\n", encoding="utf-8")
+
+
+def load_results(path: Path) -> Results:
+    """
+    Load results previously stored with `save_results`.
+
+    Raise `ValueError` if the document does not record the run settings.
+    """
+    document = json_from_str(path.read_text(encoding="utf-8"))
+    missing = [key for key in ("scale", "repeat", "results") if key not in document]
+    if missing:
+        raise ValueError(f"'{path}' is not a benchmark results file (missing: {', '.join(missing)}).")
+
+    measurements = {name: Measurement(**record) for name, record in document["results"].items()}
+    return Results(document["scale"], document["repeat"], measurements)
+
+
+def check_comparable(baseline: Results, scale: float, repeat: int) -> None:
+    """Raise `ValueError` if `baseline` was taken with different run settings."""
+    if (baseline.scale, baseline.repeat) != (scale, repeat):
+        raise ValueError(
+            f"Baseline was recorded with scale={baseline.scale}, repeat={baseline.repeat}; "
+            f"current run uses scale={scale}, repeat={repeat}."
+        )
+
+
+def compare_results(
+    current: list[Measurement], baseline: Results, tolerance: float
+) -> list[tuple[Measurement, Measurement]]:
+    """
+    Return pairs of (current, baseline) measurements whose throughput dropped more than `tolerance`.
+
+    Benchmarks missing from `baseline` are not compared; use `check_comparable` to validate the run settings first.
+    """
+    regressions = []
+    for measurement in current:
+        reference = baseline.measurements.get(measurement.name)
+        if reference and measurement.value < reference.value * (1 - tolerance):
+            regressions.append((measurement, reference))
+
+    return regressions
@@ -1,7 +1,12 @@
 """Contain a set of CLI applications."""
 
 from collections.abc import Callable
+from contextlib import AbstractContextManager
+from contextlib import nullcontext
+from cProfile import Profile
 from datetime import datetime
+from functools import wraps
+from json import dumps as json_to_str
 from json import loads as json_from_str
 from os import chdir
 from pathlib import Path
@@ -15,16 +20,25 @@ from sys import argv
 from sys import executable
 from typing import Any
 
+from click import Choice
 from click import ClickException
 from click import argument
 from click import command
 from click import echo
 from click import option
 
+from shell_tools.dirs.cleanup import remove_empty_dirs
 from shell_tools.dirs.search import find_empty_dirs
+from shell_tools.dirs.usage import DirUsage
+from shell_tools.dirs.usage import summarize_dir_usage
+from shell_tools.files.duplicates import DuplicateGroup
+from shell_tools.files.duplicates import find_duplicate_files
 from shell_tools.files.random import make_random_file
 from shell_tools.git.misc import find_repositories
 from shell_tools.git.misc import update_repository
+from shell_tools.timings import Timings
+from shell_tools.timings import record
+from shell_tools.timings import span
 
 
 def determine_file_size(size_string: str) -> int:
@@ -38,6 +52,13 @@ def determine_file_size(size_string: str) -> int:
     return 0
 
 
+def format_file_size(size: int) -> str:
+    for suffix, ratio in (("gb", 1024 * 1024 * 1024), ("mb", 1024 * 1024), ("kb", 1024)):
+        if size >= ratio:
+            return f"{size / ratio:.1f}{suffix}"
+    return str(size)
+
+
 def get_program_name() -> str:
     return Path(argv[0]).stem
 
@@ -48,26 +69,79 @@ def get_nvim_config_directory() -> Path:
     return path
 
 
+def get_peak_rss() -> int | None:
+    if system() == "Windows":
+        return None
+
+    from resource import RUSAGE_SELF
+    from resource import getrusage
+
+    peak = getrusage(RUSAGE_SELF).ru_maxrss
+    return peak if system() == "Darwin" else peak * 1024  # Linux reports kilobytes
+
+
+def print_timings(timings: Timings) -> None:
+    echo("Timings:", err=True)
+    for name, stats in timings.spans.items():
+        echo(f"  {name:<16} wall {stats.wall:>9.3f}s  cpu {stats.cpu:>9.3f}s  calls {stats.calls}", err=True)
+    for name, value in timings.counters.items():
+        echo(f"  {name:<16} {value}", err=True)
+
+    peak_rss = get_peak_rss()
+    if peak_rss is not None:
+        echo(f"  {'peak RSS':<16} {format_file_size(peak_rss)}", err=True)
+
+
+def instrumented[R](func: Callable[..., R]) -> Callable[..., R]:
+    """Add `--timings` and `--profile` options to a click command callback."""
+
+    @option("--timings", is_flag=True, help="Print phase timings and operation counters to stderr.")
+    @option("--profile", type=Path, default=None, help="Dump cProfile statistics (pstats format) to the file.")
+    @wraps(func)
+    def wrapper(*args: Any, timings: bool, profile: Path | None, **kwargs: Any) -> R:
+        recorder: AbstractContextManager[Timings | None] = record() if timings else nullcontext()
+        profiler = Profile()
+        with recorder as recorded:
+            try:
+                if profile:
+                    profiler.enable()
+                with span("total"):
+                    return func(*args, **kwargs)
+            finally:
+                if profile:
+                    profiler.disable()
+                    try:
+                        profiler.dump_stats(profile)
+                        echo(f"Profile saved to '{profile}'.", err=True)
+                    except OSError as error:
+                        echo(f"Failed to save profile to '{profile}': {error.strerror or error}", err=True)
+                if recorded is not None:
+                    print_timings(recorded)
+
+    return wrapper
+
+
 Processor = Callable[[list[Path]], None]
+DuplicatesProcessor = Callable[[list[DuplicateGroup]], None]
 
 
-class ProcessorFactory:
+class ProcessorRegistry[P]:
     _state: dict[str, Any] = {}
 
     def __init__(self) -> None:
         self.__dict__ = self._state
         if not hasattr(self, "_registry"):
-            self._registry: dict[str, Processor] = {}
+            self._registry: dict[str, P] = {}
 
-    def register(self, name: str, processor: Processor) -> Processor:
+    def register(self, name: str, processor: P) -> P:
         self._registry[name] = processor
         return processor
 
     @property
-    def processors(self) -> dict[str, Processor]:
+    def processors(self) -> dict[str, P]:
         return self._registry
 
-    def get_processor(self, name: str) -> Processor:
+    def get_processor(self, name: str) -> P:
         processor = self._registry.get(name)
         if not processor:
             raise KeyError(f"Unknown processor '{name}'")
@@ -75,6 +149,14 @@ class ProcessorFactory:
         return processor
 
 
+class ProcessorFactory(ProcessorRegistry[Processor]):
+    _state: dict[str, Any] = {}
+
+
+class DuplicatesProcessorFactory(ProcessorRegistry[DuplicatesProcessor]):
+    _state: dict[str, Any] = {}
+
+
 def dirs_processor(name: str) -> Callable[[Processor], Processor]:
     factory = ProcessorFactory()
 
@@ -92,9 +174,16 @@ def print_dirs(dirs: list[Path]) -> None:
 
 @dirs_processor(name="remove")
 def remove_dirs(dirs: list[Path]) -> None:
-    for path in dirs:
-        echo(f"Removing '{path}'")
-        path.rmdir()
+    echo(f"Removing {len(dirs)} directories...")
+    report = remove_empty_dirs(dirs)
+    for path in report.removed:
+        echo(f"Removed '{path}'")
+    for path, error in report.failed:
+        echo(f"Failed: '{path}': {error.strerror or error}", err=True)
+
+    echo(f"Finished: {len(report.removed)} removed, {len(report.failed)} failed in {report.elapsed:.2f}s.")
+    if report.failed:
+        raise ClickException(f"Failed to remove {len(report.failed)} directories.")
 
 
 def get_dirs_processor(name: str) -> Processor:
@@ -102,7 +191,74 @@ def get_dirs_processor(name: str) -> Processor:
     return factory.get_processor(name)
 
 
+def duplicates_processor(name: str) -> Callable[[DuplicatesProcessor], DuplicatesProcessor]:
+    factory = DuplicatesProcessorFactory()
+
+    def decorator(processor: DuplicatesProcessor) -> DuplicatesProcessor:
+        return factory.register(name, processor)
+
+    return decorator
+
+
+@duplicates_processor(name="print")
+def print_duplicates(groups: list[DuplicateGroup]) -> None:
+    for group in groups:
+        echo(f"{group.size} bytes x {len(group.paths)}:")
+        for path in group.paths:
+            echo(f"  {path}")
+
+
+@duplicates_processor(name="jsonl")
+def print_duplicates_as_jsonl(groups: list[DuplicateGroup]) -> None:
+    for group in groups:
+        entry = {"size": group.size, "digest": group.digest, "paths": [str(path) for path in group.paths]}
+        echo(json_to_str(entry))
+
+
+@duplicates_processor(name="hardlink")
+def hardlink_duplicates(groups: list[DuplicateGroup]) -> None:
+    linked = skipped = failed = 0
+    for group in groups:
+        original, *copies = group.paths
+        try:
+            original_device = original.stat().st_dev
+        except OSError as error:
+            echo(f"Failed: '{original}': {error.strerror or error}", err=True)
+            failed += len(copies)
+            continue
+
+        for path in copies:
+            try:
+                if path.stat().st_dev != original_device:
+                    echo(f"Skipped: '{path}' is on a different device than '{original}'", err=True)
+                    skipped += 1
+                    continue
+
+                echo(f"Linking '{path}' -> '{original}'")
+                temporary = path.with_name(f".{path.name}.hardlink")
+                temporary.hardlink_to(original)
+                try:
+                    temporary.replace(path)
+                except OSError:
+                    temporary.unlink()
+                    raise
+                linked += 1
+            except OSError as error:
+                echo(f"Failed: '{path}': {error.strerror or error}", err=True)
+                failed += 1
+
+    echo(f"Finished: {linked} linked, {skipped} skipped, {failed} failed.")
+    if failed:
+        raise ClickException(f"Failed to link {failed} duplicates.")
+
+
+def get_duplicates_processor(name: str) -> DuplicatesProcessor:
+    factory = DuplicatesProcessorFactory()
+    return factory.get_processor(name)
+
+
 @command()
+@instrumented
 @argument("path", type=Path)
 @option("--size", type=str, default="10mb", help="File size in bytes[kb|mb|gb].", show_default=True)
 @option("--line-size", type=int, default=64, help="Length of line/chunk.", show_default=True)
@@ -135,6 +291,7 @@ def generate_file(path: Path, size: str, line_size: int) -> None:
 
 
 @command()
+@instrumented
 @argument("root-dir", type=Path, default=Path.cwd())
 @option("--ignore-empty-files", is_flag=True, help="Treat empty files as absent.")
 @option("--remove/--no-remove", is_flag=True, help="Remove empty directories.")
@@ -144,12 +301,112 @@ def discover_empty_dirs(root_dir: Path, ignore_empty_files: bool, remove: bool)
     if not root_dir.is_dir():
         raise ClickException(f"Root directory '{root_dir}' does not exist or is not a directory.")
 
-    empty_dirs = find_empty_dirs(root_dir, ignore_empty_files)
+    with span("scan"):
+        empty_dirs = find_empty_dirs(root_dir, ignore_empty_files)
+
     processor = get_dirs_processor("remove" if remove else "print")
-    processor(empty_dirs)
+    with span("process"):
+        processor(empty_dirs)
 
 
 @command()
+@instrumented
+@argument("root-dir", type=Path, default=Path.cwd())
+@option(
+    "--min-size", type=str, default="1", help="Skip files smaller than this size in bytes[kb|mb|gb].", show_default=True
+)
+@option("--workers", type=int, default=None, help="Number of hashing threads (chosen automatically by default).")
+@option(
+    "--output",
+    type=Choice(list(DuplicatesProcessorFactory().processors)),
+    default="print",
+    help="How to process found duplicates.",
+    show_default=True,
+)
+def discover_duplicate_files(root_dir: Path, min_size: str, workers: int | None, output: str) -> None:
+    """Find files with identical content."""
+    root_dir = root_dir.absolute()
+    if not root_dir.is_dir():
+        raise ClickException(f"Root directory '{root_dir}' does not exist or is not a directory.")
+
+    min_file_size = determine_file_size(min_size)
+    if not min_file_size:
+        raise ClickException(f"Invalid minimal file size (min-size={min_size}).")
+
+    if workers is not None and workers <= 0:
+        raise ClickException(f"Invalid number of workers (workers={workers}).")
+
+    report = find_duplicate_files(root_dir, min_file_size, workers)
+    processor = get_duplicates_processor(output)
+    with span("process"):
+        processor(report.groups)
+
+    echo(
+        f"Scanned {report.files_scanned} files ({report.bytes_scanned} bytes), "
+        f"hashed {report.bytes_hashed} bytes, found {len(report.groups)} duplicate groups.",
+        err=True,
+    )
+
+
+@command()
+@instrumented
+@argument("root-dir", type=Path, default=Path.cwd())
+@option("--top", type=int, default=None, help="Number of the largest subtrees to print.  [default: 10]")
+@option("--depth", type=int, default=None, help="Print a tree limited to this depth instead of the largest subtrees.")
+@option("--apparent-size", is_flag=True, help="Use apparent sizes instead of disk usage.")
+@option("--workers", type=int, default=None, help="Number of scanning threads (chosen automatically by default).")
+def show_dir_usage(
+    root_dir: Path, top: int | None, depth: int | None, apparent_size: bool, workers: int | None
+) -> None:
+    """Summarize disk usage of directories."""
+    root_dir = root_dir.absolute()
+    if not root_dir.is_dir():
+        raise ClickException(f"Root directory '{root_dir}' does not exist or is not a directory.")
+
+    if depth is not None and depth < 0:
+        raise ClickException(f"Invalid depth (depth={depth}).")
+
+    if depth is not None and top is not None:
+        raise ClickException("Options --top and --depth cannot be used together.")
+
+    if top is None:
+        top = 10
+    elif top <= 0:
+        raise ClickException(f"Invalid number of subtrees (top={top}).")
+
+    if workers is not None and workers <= 0:
+        raise ClickException(f"Invalid number of workers (workers={workers}).")
+
+    def get_size(usage: DirUsage) -> int:
+        return usage.apparent_size if apparent_size else usage.allocated_size
+
+    def print_tree(usage: DirUsage) -> None:
+        indent = "  " * usage.depth
+        name = str(usage.path) if not usage.depth else usage.path.name
+        echo(f"{format_file_size(get_size(usage)):>10}  {indent}{name}")
+        for child in sorted(usage.children, key=get_size, reverse=True):
+            print_tree(child)
+
+    if depth is not None:
+        with span("scan"):
+            report = summarize_dir_usage(root_dir, max_depth=depth, apparent=apparent_size, workers=workers)
+        with span("print"):
+            print_tree(report.root)
+    else:
+        with span("scan"):
+            report = summarize_dir_usage(root_dir, top=top, apparent=apparent_size, workers=workers)
+        with span("print"):
+            for usage in report.largest:
+                echo(f"{format_file_size(get_size(usage)):>10}  {usage.path}")
+
+    root = report.root
+    echo(f"Total: {format_file_size(get_size(root))} in {root.files} files and {root.dirs} directories.", err=True)
+    if report.errors:
+        echo(f"Skipped {report.errors} unreadable entries.", err=True)
+
+
+@command()
+@instrumented
 @argument("root-dir", type=Path, default=Path.cwd())
 @option("-r", "--recursive", is_flag=True, help="Search git repos recursively")
 @option("--submodules/--no-submodules", is_flag=True, help="Update submodules after pull.")
@@ -162,14 +419,18 @@ def sync_repos(root_dir: Path, recursive: bool, submodules: bool) -> None:
     suffix = "recursively " if recursive else ""
     echo(f"Scanning '{root_dir}' for git repositories {suffix}...")
 
-    repos = find_repositories(root_dir, recursive)
+    with span("scan"):
+        repos = find_repositories(root_dir, recursive)
+
+    update = span("update")
     synced = 0
     failed = 0
     for repo in repos:
         repo_relative_path = repo.relative_to(root_dir)
         repo_name = "<root>" if repo_relative_path == Path(".") else str(repo_relative_path)
         try:
-            update_repository(repo, submodules)
+            with update:
+                update_repository(repo, submodules)
             synced += 1
             echo(f"Synced: {repo_name}")
         except CalledProcessError as error:
@@ -185,7 +446,8 @@ def sync_repos(root_dir: Path, recursive: bool, submodules: bool) -> None:
         raise ClickException(f"Failed to sync {failed} repositories.")
 
 
-@command(options_metavar="")
+@command()
+@instrumented
 def edit_nvim_config() -> None:
     """Shortcut to edit nvim config."""
 
@@ -204,7 +466,8 @@ def edit_nvim_config() -> None:
         chdir(working_directory)
 
 
-@command(options_metavar="")
+@command()
+@instrumented
 @argument("timestamp", type=float, required=False)
 @option(
     "-f",
@@ -233,7 +496,8 @@ def pretty_date(timestamp: float | None, date_format: str) -> None:
         exit(1)
 
 
-@command(options_metavar="")
+@command()
+@instrumented
 @option(
     "--all/--outdated",
     is_flag=True,
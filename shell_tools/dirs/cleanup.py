@@ -0,0 +1,85 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from os import O_RDONLY
+from os import close
+from os import open as open_fd
+from os import rmdir
+from os import supports_dir_fd
+from pathlib import Path
+from time import perf_counter
+
+from shell_tools.timings import count
+
+BATCH_SIZE = 256
+
+
+@dataclass
+class RemovalReport:
+    """Outcome of a directories removal."""
+
+    removed: list[Path] = field(default_factory=list)
+    failed: list[tuple[Path, OSError]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+def remove_empty_dirs(dirs: Iterable[Path], workers: int | None = None) -> RemovalReport:
+    """
+    Remove empty `dirs` using a pool of `workers` threads.
+
+    Deeper directories are removed before shallower ones, so children go before their parents.
+    Siblings are removed in batches relative to their opened parent, and failures are collected instead of raised.
+    """
+    started = perf_counter()
+    levels: defaultdict[int, defaultdict[Path, list[str]]] = defaultdict(lambda: defaultdict(list))
+    for path in dirs:
+        path = path.absolute()
+        levels[len(path.parts)][path.parent].append(path.name)
+
+    report = RemovalReport()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for depth in sorted(levels, reverse=True):
+            batches = [
+                (parent, names[offset : offset + BATCH_SIZE])
+                for parent, names in levels[depth].items()
+                for offset in range(0, len(names), BATCH_SIZE)
+            ]
+            for removed, failed in executor.map(lambda batch: _remove_children(*batch), batches):
+                report.removed.extend(removed)
+                report.failed.extend(failed)
+
+    report.elapsed = perf_counter() - started
+    return report
+
+
+def _remove_children(parent: Path, names: list[str]) -> tuple[list[Path], list[tuple[Path, OSError]]]:
+    removed: list[Path] = []
+    failed: list[tuple[Path, OSError]] = []
+    if rmdir not in supports_dir_fd:
+        for name in names:
+            try:
+                rmdir(parent / name)
+                removed.append(parent / name)
+            except OSError as error:
+                failed.append((parent / name, error))
+        return removed, failed
+
+    try:
+        parent_fd = open_fd(parent, O_RDONLY)
+        count("dirs opened")
+    except OSError as error:
+        return [], [(parent / name, error) for name in names]
+
+    try:
+        for name in names:
+            try:
+                rmdir(name, dir_fd=parent_fd)
+                removed.append(parent / name)
+            except OSError as error:
+                failed.append((parent / name, error))
+    finally:
+        close(parent_fd)
+
+    return removed, failed
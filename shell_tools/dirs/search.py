@@ -1,6 +1,11 @@
+from collections.abc import Iterator
 from os import PathLike
+from os import scandir
+from os import stat_result
 from pathlib import Path
 
+from shell_tools.timings import count
+
 
 def find_empty_dirs(root: str | PathLike[str], ignore_empty_files: bool = False) -> list[Path]:
     """Find all empty dirs recursively from a given `root` directory."""
@@ -24,11 +29,15 @@ def _find_empty_dirs(start_directory: Path, ignore_empty_files: bool, visited: s
     result = []
     items = [path for path in start_directory.iterdir()]
     dirs = [path for path in items if path.is_dir()]
+    count("dirs opened")
+    count("stats issued", len(items))
     if not dirs:
         files = [path for path in items if path.is_file()]
+        count("stats issued", len(items))
         if not files:
             result.append(start_directory)
         elif ignore_empty_files:
+            count("stats issued", len(files))
             non_empty = any(file.stat().st_size > 0 for file in files)
             if not non_empty:
                 result.append(start_directory)
@@ -39,3 +48,28 @@ def _find_empty_dirs(start_directory: Path, ignore_empty_files: bool, visited: s
         result.extend(_find_empty_dirs(child_dir, ignore_empty_files, visited))
 
     return result
+
+
+def iter_files(root: str | PathLike[str]) -> Iterator[tuple[Path, stat_result]]:
+    """
+    Walk the `root` directory and yield every regular file together with its `stat` result.
+
+    Symlinks are not followed and entries that disappear or cannot be read during the walk are skipped.
+    """
+    pending = [str(root)]
+    while pending:
+        directory = pending.pop()
+        try:
+            with scandir(directory) as entries:
+                count("dirs opened")
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            count("stats issued")
+                            yield Path(entry.path), entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from dataclasses import field
+from heapq import heappush
+from heapq import heappushpop
+from os import PathLike
+from os import cpu_count
+from os import scandir
+from os import stat_result
+from pathlib import Path
+from queue import LifoQueue
+from threading import Lock
+from threading import Thread
+
+from shell_tools.timings import count
+
+BLOCK_SIZE = 512
+
+
+@dataclass
+class DirUsage:
+    """Aggregated disk usage of a directory subtree."""
+
+    path: Path
+    depth: int
+    apparent_size: int = 0
+    allocated_size: int = 0
+    files: int = 0
+    dirs: int = 0
+    children: list["DirUsage"] = field(default_factory=list)
+
+
+@dataclass
+class DirUsageReport:
+    """Result of the disk usage summary."""
+
+    root: DirUsage
+    largest: list[DirUsage] = field(default_factory=list)
+    errors: int = 0
+
+
+def allocated_size(stats: stat_result) -> int:
+    """Return the number of bytes allocated on disk for the `stats` owner (falls back to its apparent size)."""
+    blocks: int | None = getattr(stats, "st_blocks", None)
+    return stats.st_size if blocks is None else blocks * BLOCK_SIZE
+
+
+def summarize_dir_usage(
+    root: str | PathLike[str], max_depth: int = 0, top: int = 0, apparent: bool = False, workers: int | None = None
+) -> DirUsageReport:
+    """
+    Summarize apparent and allocated sizes of the `root` directory subtree.
+
+    Directories are scanned by a pool of `workers` threads and sizes are aggregated bottom-up.
+    Files with several hardlinks are counted once. Only subtrees within `max_depth` levels below `root`
+    keep their children, and only the `top` largest subtrees below `root` (by allocated or `apparent` size) are collected,
+    so memory stays bounded by the walk frontier rather than by the number of files.
+    """
+    start_directory = Path(root)
+    walker = _UsageWalker(max_depth, top, apparent)
+    return walker.run(start_directory, workers or min(32, (cpu_count() or 1) + 4))
+
+
+class _Node:
+    __slots__ = ("usage", "parent", "pending", "lock")
+
+    def __init__(self, usage: DirUsage, parent: "_Node | None") -> None:
+        self.usage = usage
+        self.parent = parent
+        self.pending = 1
+        self.lock = Lock()
+
+
+class _UsageWalker:
+    def __init__(self, max_depth: int, top: int, apparent: bool) -> None:
+        self._max_depth = max_depth
+        self._top = top
+        self._apparent = apparent
+        self._queue: LifoQueue[_Node | None] = LifoQueue()
+        self._lock = Lock()
+        self._inodes: set[tuple[int, int]] = set()
+        self._largest: list[tuple[int, str, DirUsage]] = []
+        self._errors = 0
+
+    def run(self, root: Path, workers: int) -> DirUsageReport:
+        root_node = _Node(DirUsage(root, 0), None)
+        try:
+            self._add_own_size(root_node.usage, root.stat())
+        except OSError:
+            self._errors += 1
+            return DirUsageReport(root_node.usage, errors=self._errors)
+
+        self._queue.put(root_node)
+        threads = [Thread(target=self._work, daemon=True) for _ in range(max(1, workers))]
+        for thread in threads:
+            thread.start()
+
+        self._queue.join()
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
+
+        largest = [usage for *_, usage in sorted(self._largest, key=lambda item: (-item[0], item[1]))]
+        return DirUsageReport(root_node.usage, largest, self._errors)
+
+    def _work(self) -> None:
+        while True:
+            node = self._queue.get()
+            if node is None:
+                self._queue.task_done()
+                return
+
+            try:
+                self._scan(node)
+                self._complete(node)
+            finally:
+                self._queue.task_done()
+
+    def _scan(self, node: _Node) -> None:
+        usage = node.usage
+        files = apparent_size = allocated = stats_issued = 0
+        try:
+            with scandir(usage.path) as entries:
+                count("dirs opened")
+                for entry in entries:
+                    try:
+                        stats_issued += 1
+                        stats = entry.stat(follow_symlinks=False)
+                        if entry.is_dir(follow_symlinks=False):
+                            child = _Node(DirUsage(Path(entry.path), usage.depth + 1), node)
+                            self._add_own_size(child.usage, stats)
+                            with node.lock:
+                                node.pending += 1
+                            self._queue.put(child)
+                            continue
+
+                        files += 1
+                        if stats.st_nlink > 1 and not self._claim_inode(stats):
+                            continue
+                        apparent_size += stats.st_size
+                        allocated += allocated_size(stats)
+                    except OSError:
+                        self._count_error()
+        except OSError:
+            self._count_error()
+
+        count("stats issued", stats_issued)
+        with node.lock:
+            usage.files += files
+            usage.apparent_size += apparent_size
+            usage.allocated_size += allocated
+
+    def _complete(self, node: _Node | None) -> None:
+        while node is not None:
+            with node.lock:
+                node.pending -= 1
+                if node.pending:
+                    return
+
+            usage = node.usage
+            self._collect(usage)
+
+            parent = node.parent
+            if parent is not None:
+                with parent.lock:
+                    parent.usage.apparent_size += usage.apparent_size
+                    parent.usage.allocated_size += usage.allocated_size
+                    parent.usage.files += usage.files
+                    parent.usage.dirs += usage.dirs + 1
+                    if usage.depth <= self._max_depth:
+                        parent.usage.children.append(usage)
+            node = parent
+
+    def _collect(self, usage: DirUsage) -> None:
+        if not self._top or not usage.depth:
+            return
+
+        size = usage.apparent_size if self._apparent else usage.allocated_size
+        item = (size, str(usage.path), usage)
+        with self._lock:
+            if len(self._largest) < self._top:
+                heappush(self._largest, item)
+            elif size > self._largest[0][0]:
+                heappushpop(self._largest, item)
+
+    def _claim_inode(self, stats: stat_result) -> bool:
+        inode = (stats.st_dev, stats.st_ino)
+        with self._lock:
+            if inode in self._inodes:
+                return False
+            self._inodes.add(inode)
+            return True
+
+    def _count_error(self) -> None:
+        with self._lock:
+            self._errors += 1
+
+    @staticmethod
+    def _add_own_size(usage: DirUsage, stats: stat_result) -> None:
+        usage.apparent_size += stats.st_size
+        usage.allocated_size += allocated_size(stats)
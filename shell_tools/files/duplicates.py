@@ -0,0 +1,158 @@
+from collections import defaultdict
+from collections.abc import Callable
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from hashlib import blake2b
+from mmap import ACCESS_READ
+from mmap import mmap
+from os import PathLike
+from pathlib import Path
+
+from shell_tools.dirs.search import iter_files
+from shell_tools.timings import count
+from shell_tools.timings import span
+
+EDGE_SIZE = 4 * 1024
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class DuplicateGroup:
+    """Files with identical content."""
+
+    size: int
+    digest: str
+    paths: list[Path]
+
+
+@dataclass
+class DuplicatesReport:
+    """Result of the duplicates search together with the amount of I/O it required."""
+
+    groups: list[DuplicateGroup] = field(default_factory=list)
+    files_scanned: int = 0
+    bytes_scanned: int = 0
+    bytes_hashed: int = 0
+
+
+def hash_edges(path: str | PathLike[str], size: int, edge_size: int = EDGE_SIZE) -> tuple[str, int]:
+    """
+    Hash the first and the last `edge_size` bytes of the file.
+
+    Return the hex digest and the number of bytes read. Files not larger than two edges are hashed entirely.
+    """
+    digest = blake2b()
+    with open(path, "rb") as file:
+        if size <= 2 * edge_size:
+            data = file.read()
+            digest.update(data)
+            return digest.hexdigest(), len(data)
+
+        head = file.read(edge_size)
+        file.seek(-edge_size, 2)
+        tail = file.read(edge_size)
+
+    digest.update(head)
+    digest.update(tail)
+    return digest.hexdigest(), len(head) + len(tail)
+
+
+def hash_file(path: str | PathLike[str], chunk_size: int = CHUNK_SIZE) -> tuple[str, int]:
+    """
+    Hash the whole file content by mapping it into memory.
+
+    Return the hex digest and the number of bytes read.
+    """
+    digest = blake2b()
+    with open(path, "rb") as file:
+        size = file.seek(0, 2)
+        if not size:
+            return digest.hexdigest(), 0
+
+        with mmap(file.fileno(), 0, access=ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, size, chunk_size):
+                    digest.update(view[offset : offset + chunk_size])
+            finally:
+                view.release()
+
+    return digest.hexdigest(), size
+
+
+def find_duplicate_files(root: str | PathLike[str], min_size: int = 1, workers: int | None = None) -> DuplicatesReport:
+    """
+    Find files with identical content in the `root` directory.
+
+    Candidates are narrowed down by size first, then by a hash of the file edges,
+    and only the remaining ones are fully hashed. Hashing runs in a thread pool of `workers` threads.
+    Hardlinks to the same file are reported once since they do not take extra space.
+    """
+    report = DuplicatesReport()
+    start_directory = Path(root)
+    if not start_directory.is_dir():
+        return report
+
+    by_size: defaultdict[int, list[Path]] = defaultdict(list)
+    inodes: set[tuple[int, int]] = set()
+    with span("scan"):
+        for path, stats in iter_files(start_directory):
+            report.files_scanned += 1
+            report.bytes_scanned += stats.st_size
+            if stats.st_size < min_size:
+                continue
+
+            inode = (stats.st_dev, stats.st_ino)
+            if inode in inodes:
+                continue
+            inodes.add(inode)
+            by_size[stats.st_size].append(path)
+
+    candidates = [(size, paths) for size, paths in by_size.items() if len(paths) > 1]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        with span("hash edges"):
+            by_edges = _group_by_hash(executor, candidates, lambda path, size: hash_edges(path, size), report)
+
+        full_candidates = [(size, paths) for (size, _), paths in by_edges.items() if size > 2 * EDGE_SIZE]
+        with span("hash content"):
+            by_content = _group_by_hash(executor, full_candidates, lambda path, _: hash_file(path), report)
+
+    for (size, digest), paths in by_edges.items():
+        if size <= 2 * EDGE_SIZE:
+            report.groups.append(DuplicateGroup(size, digest, sorted(paths)))
+    for (size, digest), paths in by_content.items():
+        report.groups.append(DuplicateGroup(size, digest, sorted(paths)))
+
+    report.groups.sort(key=lambda group: (-group.size, group.paths[0]))
+    return report
+
+
+def _group_by_hash(
+    executor: ThreadPoolExecutor,
+    candidates: Iterable[tuple[int, list[Path]]],
+    hasher: Callable[[Path, int], tuple[str, int]],
+    report: DuplicatesReport,
+) -> dict[tuple[int, str], list[Path]]:
+    jobs = [(size, path) for size, paths in candidates for path in paths]
+    results = executor.map(lambda job: _try_hash(hasher, job[1], job[0]), jobs)
+
+    groups: defaultdict[tuple[int, str], list[Path]] = defaultdict(list)
+    for (size, path), result in zip(jobs, results, strict=True):
+        if result is None:
+            continue
+
+        digest, bytes_read = result
+        count("files hashed")
+        report.bytes_hashed += bytes_read
+        groups[(size, digest)].append(path)
+
+    return {key: paths for key, paths in groups.items() if len(paths) > 1}
+
+
+def _try_hash(hasher: Callable[[Path, int], tuple[str, int]], path: Path, size: int) -> tuple[str, int] | None:
+    try:
+        return hasher(path, size)
+    except OSError:
+        return None
@@ -4,6 +4,10 @@ from string import ascii_uppercase
 from string import digits
 from typing import TextIO
 
+from shell_tools.timings import span
+
+BATCH_SIZE = 1024 * 1024
+
 
 def make_trash_string(size: int = 1024, allowed_chars: str = ascii_uppercase + digits) -> str:
     """Make a string of `size` from the set of `allowed_chars`."""
@@ -11,15 +15,26 @@ def make_trash_string(size: int = 1024, allowed_chars: str = ascii_uppercase + d
 
 
 def write_random_data(io: TextIO, size: int, chunk_size: int = 1024) -> None:
-    """Write random data into `io`-object in the amount equal to `size`."""
+    """
+    Write random data into `io`-object in the amount equal to `size`.
+
+    Lines are generated and written in batches of about `BATCH_SIZE` characters.
+    """
+    generate, write = span("generate"), span("write")
     full_rows_count, remains = divmod(size, chunk_size)
-    for _ in range(full_rows_count):
-        generated_line = make_trash_string(chunk_size - 1) + "\n"
-        io.write(generated_line)
+    rows_per_batch = max(1, BATCH_SIZE // chunk_size)
+    for first_row in range(0, full_rows_count, rows_per_batch):
+        rows_count = min(rows_per_batch, full_rows_count - first_row)
+        with generate:
+            generated_lines = "".join(make_trash_string(chunk_size - 1) + "\n" for _ in range(rows_count))
+        with write:
+            io.write(generated_lines)
 
     if remains:
-        generated_line = make_trash_string(remains - 1) + "\n"
-        io.write(generated_line)
+        with generate:
+            generated_line = make_trash_string(remains - 1) + "\n"
+        with write:
+            io.write(generated_line)
 
 
 def make_random_file(path: str | PathLike[str], size: int, line_length: int = 1024) -> None:
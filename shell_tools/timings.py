@@ -0,0 +1,102 @@
+"""
+Lightweight phase timings and operation counters.
+
+Instrumented code calls `span` and `count` unconditionally; both are no-ops unless a `Timings`
+recorder is active (see `record`), so hot paths pay only for a global lookup when timings are off.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from threading import Lock
+from time import perf_counter
+from time import process_time
+from types import TracebackType
+
+
+@dataclass
+class SpanStats:
+    """Accumulated time spent in a named span."""
+
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+
+@dataclass
+class Timings:
+    """Spans and counters collected while the recorder is active."""
+
+    spans: dict[str, SpanStats] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def add_span(self, name: str, wall: float, cpu: float) -> None:
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = SpanStats()
+            stats.wall += wall
+            stats.cpu += cpu
+            stats.calls += 1
+
+    def add_count(self, name: str, amount: int) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+
+class Span:
+    """Context manager adding the wall and CPU time of its block to a named span."""
+
+    __slots__ = ("_timings", "_name", "_wall", "_cpu")
+
+    def __init__(self, timings: Timings | None, name: str) -> None:
+        self._timings = timings
+        self._name = name
+        self._wall = 0.0
+        self._cpu = 0.0
+
+    def __enter__(self) -> None:
+        if self._timings is not None:
+            self._wall = perf_counter()
+            self._cpu = process_time()
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        if self._timings is not None:
+            self._timings.add_span(self._name, perf_counter() - self._wall, process_time() - self._cpu)
+
+
+_NULL_SPAN = Span(None, "")
+_active: Timings | None = None
+
+
+def span(name: str) -> Span:
+    """
+    Return a context manager timing its block as `name`.
+
+    The returned object can be re-entered sequentially, so loops can create it once outside the loop.
+    """
+    if _active is None:
+        return _NULL_SPAN
+    return Span(_active, name)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Increase the `name` counter by `amount`."""
+    if _active is not None:
+        _active.add_count(name, amount)
+
+
+@contextmanager
+def record() -> Iterator[Timings]:
+    """Activate a new recorder for the duration of the block."""
+    global _active
+    timings = Timings()
+    previous, _active = _active, timings
+    try:
+        yield timings
+    finally:
+        _active = previous
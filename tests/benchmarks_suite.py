@@ -0,0 +1,66 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest import main
+
+from benchmarks.suite import Measurement
+from benchmarks.suite import Results
+from benchmarks.suite import check_comparable
+from benchmarks.suite import compare_results
+from benchmarks.suite import load_results
+from benchmarks.suite import save_results
+
+
+def make_measurement(name: str, value: float) -> Measurement:
+    return Measurement(name, value, "dirs/s", 1.0)
+
+
+class SuiteTestCase(TestCase):
+    def test_save_and_load_results_round_trip(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            path = Path(dir_name) / "results.json"
+            measurements = [make_measurement("one", 100.0), make_measurement("two", 2.5)]
+
+            save_results(path, measurements, scale=0.5, repeat=2)
+            results = load_results(path)
+
+            self.assertEqual(0.5, results.scale)
+            self.assertEqual(2, results.repeat)
+            self.assertEqual({measurement.name: measurement for measurement in measurements}, results.measurements)
+
+    def test_load_results_requires_run_settings(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            path = Path(dir_name) / "results.json"
+            path.write_text('{"results": {}}', encoding="utf-8")
+
+            with self.assertRaisesRegex(ValueError, "missing: scale, repeat"):
+                load_results(path)
+
+    def test_compare_results_applies_tolerance(self) -> None:
+        baseline = Results(1.0, 3, {"bench": make_measurement("bench", 100.0)})
+
+        inside = compare_results([make_measurement("bench", 90.5)], baseline, tolerance=0.1)
+        outside = compare_results([make_measurement("bench", 89.5)], baseline, tolerance=0.1)
+
+        self.assertEqual([], inside)
+        self.assertEqual([(make_measurement("bench", 89.5), baseline.measurements["bench"])], outside)
+
+    def test_compare_results_skips_benchmarks_missing_from_baseline(self) -> None:
+        baseline = Results(1.0, 3, {"bench": make_measurement("bench", 100.0)})
+
+        regressions = compare_results([make_measurement("new", 1.0)], baseline, tolerance=0.1)
+
+        self.assertEqual([], regressions)
+
+    def test_check_comparable_rejects_other_run_settings(self) -> None:
+        baseline = Results(1.0, 3, {})
+
+        check_comparable(baseline, scale=1.0, repeat=3)
+        with self.assertRaisesRegex(ValueError, "scale=1.0, repeat=3"):
+            check_comparable(baseline, scale=0.5, repeat=3)
+        with self.assertRaisesRegex(ValueError, "scale=1.0, repeat=3"):
+            check_comparable(baseline, scale=1.0, repeat=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
+from json import dumps as json_to_str
 from pathlib import Path
+from pstats import Stats
 from subprocess import CalledProcessError
 from tempfile import TemporaryDirectory
 from types import SimpleNamespace
@@ -8,10 +10,12 @@ from unittest.mock import patch
 
 from click.testing import CliRunner
 
+from shell_tools.cli import discover_duplicate_files
 from shell_tools.cli import discover_empty_dirs
 from shell_tools.cli import edit_nvim_config
 from shell_tools.cli import generate_file
 from shell_tools.cli import pretty_date
+from shell_tools.cli import show_dir_usage
 from shell_tools.cli import sync_repos
 from shell_tools.cli import update_python_packages
 
@@ -51,6 +55,98 @@ class CliTestCase(TestCase):
             self.assertEqual(0, result.exit_code)
             self.assertFalse(empty_dir.exists())
             self.assertIn("Removing", result.output)
+            self.assertIn(f"Removed '{empty_dir}'", result.output)
+
+    def test_discover_duplicate_files_prints_duplicates_as_jsonl(self) -> None:
+        with TemporaryDirectory() as root_dir_name:
+            root_dir = Path(root_dir_name)
+            (root_dir / "one").write_bytes(b"same data")
+            (root_dir / "two").write_bytes(b"same data")
+
+            result = self.runner.invoke(discover_duplicate_files, [str(root_dir), "--output", "jsonl"])
+
+            self.assertEqual(0, result.exit_code)
+            self.assertIn(json_to_str([str(root_dir / "one"), str(root_dir / "two")]), result.output)
+            self.assertIn("hashed 18 bytes", result.output)
+
+    def test_discover_duplicate_files_hardlink_links_copies(self) -> None:
+        with TemporaryDirectory() as root_dir_name:
+            root_dir = Path(root_dir_name)
+            (root_dir / "one").write_bytes(b"same data")
+            (root_dir / "two").write_bytes(b"same data")
+
+            result = self.runner.invoke(discover_duplicate_files, [str(root_dir), "--output", "hardlink"])
+
+            self.assertEqual(0, result.exit_code)
+            self.assertTrue((root_dir / "one").samefile(root_dir / "two"))
+            self.assertEqual(["one", "two"], sorted(path.name for path in root_dir.iterdir()))
+
+    def test_discover_duplicate_files_hardlink_continues_after_failure(self) -> None:
+        with TemporaryDirectory() as root_dir_name:
+            root_dir = Path(root_dir_name)
+            for name in ("a", "b", "c"):
+                (root_dir / name).write_bytes(b"same data")
+            (root_dir / ".b.hardlink").write_bytes(b"stale")
+
+            result = self.runner.invoke(discover_duplicate_files, [str(root_dir), "--output", "hardlink"])
+
+            self.assertEqual(1, result.exit_code)
+            self.assertIn(f"Failed: '{root_dir / 'b'}'", result.output)
+            self.assertIn("Finished: 1 linked, 0 skipped, 1 failed.", result.output)
+            self.assertFalse((root_dir / "a").samefile(root_dir / "b"))
+            self.assertTrue((root_dir / "a").samefile(root_dir / "c"))
+
+    def test_discover_empty_dirs_remove_reports_failures(self) -> None:
+        with TemporaryDirectory() as root_dir_name:
+            root_dir = Path(root_dir_name)
+            empty_dir = root_dir / "empty"
+            empty_dir.mkdir()
+            (root_dir / "not-empty").mkdir()
+            (root_dir / "not-empty" / "file").touch()
+
+            result = self.runner.invoke(discover_empty_dirs, [str(root_dir), "--remove", "--ignore-empty-files"])
+
+            self.assertEqual(1, result.exit_code)
+            self.assertFalse(empty_dir.exists())
+            self.assertIn(f"Failed: '{root_dir / 'not-empty'}'", result.output)
+            self.assertIn("Finished: 1 removed, 1 failed", result.output)
+
+    def test_discover_empty_dirs_timings_prints_phases_and_counters(self) -> None:
+        with TemporaryDirectory() as root_dir_name:
+            root_dir = Path(root_dir_name)
+            (root_dir / "empty").mkdir()
+
+            result = self.runner.invoke(discover_empty_dirs, [str(root_dir), "--timings"])
+
+            self.assertEqual(0, result.exit_code)
+            self.assertIn("Timings:", result.output)
+            self.assertIn("scan", result.output)
+            self.assertIn("process", result.output)
+            self.assertIn("dirs opened", result.output)
+
+    def test_generate_file_profile_dumps_statistics(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            output_path = Path(dir_name) / "sample.bin"
+            profile_path = Path(dir_name) / "profile.pstats"
+
+            arguments = [str(output_path), "--size", "1kb", "--profile", str(profile_path)]
+            result = self.runner.invoke(generate_file, arguments)
+
+            self.assertEqual(0, result.exit_code)
+            self.assertIn("Profile saved", result.output)
+            self.assertTrue(Stats(str(profile_path)).get_stats_profile().func_profiles)
+
+    def test_generate_file_reports_unwritable_profile_and_still_prints_timings(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            output_path = Path(dir_name) / "sample.bin"
+
+            arguments = [str(output_path), "--size", "1kb", "--profile", dir_name, "--timings"]
+            result = self.runner.invoke(generate_file, arguments)
+
+            self.assertEqual(0, result.exit_code)
+            self.assertIn(f"Failed to save profile to '{dir_name}'", result.output)
+            self.assertIn("Timings:", result.output)
+            self.assertTrue(output_path.exists())
 
     def test_generate_file_creates_expected_output_file(self) -> None:
         with TemporaryDirectory() as dir_name:
@@ -175,6 +271,36 @@ class CliTestCase(TestCase):
             self.assertIn("Synced: <root>", result.output)
             self.assertIn("Finished: 1 synced, 0 failed.", result.output)
 
+    def test_show_dir_usage_prints_largest_subtrees(self) -> None:
+        with TemporaryDirectory() as root_dir_name:
+            root_dir = Path(root_dir_name)
+            (root_dir / "large").mkdir()
+            (root_dir / "large" / "file").write_bytes(b"x" * 4096)
+
+            result = self.runner.invoke(show_dir_usage, [str(root_dir), "--top", "2", "--apparent-size"])
+
+            self.assertEqual(0, result.exit_code)
+            self.assertIn(str(root_dir / "large"), result.output)
+            self.assertIn("Total:", result.output)
+
+    def test_show_dir_usage_rejects_top_with_depth(self) -> None:
+        with TemporaryDirectory() as root_dir_name:
+            result = self.runner.invoke(show_dir_usage, [root_dir_name, "--top", "5", "--depth", "1"])
+
+            self.assertEqual(1, result.exit_code)
+            self.assertIn("--top and --depth cannot be used together", result.output)
+
+    def test_show_dir_usage_prints_depth_limited_tree(self) -> None:
+        with TemporaryDirectory() as root_dir_name:
+            root_dir = Path(root_dir_name)
+            (root_dir / "one" / "nested").mkdir(parents=True)
+
+            result = self.runner.invoke(show_dir_usage, [str(root_dir), "--depth", "1"])
+
+            self.assertEqual(0, result.exit_code)
+            self.assertIn("  one", result.output)
+            self.assertNotIn("nested", result.output)
+
     def test_update_python_packages_uses_active_interpreter(self) -> None:
         with (
             patch("shell_tools.cli.system", return_value="Windows"),
@@ -0,0 +1,58 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest import main
+from unittest.mock import patch
+
+from shell_tools.dirs.cleanup import remove_empty_dirs
+from shell_tools.timings import record
+
+
+class CleanupTestCase(TestCase):
+    def test_remove_empty_dirs_removes_children_before_parents(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            nested = root / "parent" / "child" / "grandchild"
+            nested.mkdir(parents=True)
+            siblings = [root / "parent" / f"sibling-{index}" for index in range(10)]
+            for sibling in siblings:
+                sibling.mkdir()
+
+            report = remove_empty_dirs([root / "parent", nested.parent, *siblings, nested], workers=4)
+
+            self.assertEqual(13, len(report.removed))
+            self.assertEqual([], report.failed)
+            self.assertEqual([], list(root.iterdir()))
+
+    def test_remove_empty_dirs_collects_failures_and_continues(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            (root / "not-empty").mkdir()
+            (root / "not-empty" / "file").touch()
+            (root / "empty").mkdir()
+            missing = root / "missing"
+
+            report = remove_empty_dirs([root / "not-empty", missing, root / "empty"])
+
+            self.assertEqual([root / "empty"], report.removed)
+            self.assertCountEqual([root / "not-empty", missing], [path for path, _ in report.failed])
+            self.assertFalse((root / "empty").exists())
+            self.assertGreaterEqual(report.elapsed, 0.0)
+
+    def test_remove_empty_dirs_splits_siblings_into_batches(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            dirs = [root / f"dir-{index}" for index in range(5)]
+            for path in dirs:
+                path.mkdir()
+
+            with patch("shell_tools.dirs.cleanup.BATCH_SIZE", 2), record() as timings:
+                report = remove_empty_dirs(dirs)
+
+            self.assertEqual(3, timings.counters["dirs opened"])
+            self.assertCountEqual(dirs, report.removed)
+            self.assertEqual([], list(root.iterdir()))
+
+
+if __name__ == "__main__":
+    main()
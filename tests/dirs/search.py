@@ -5,6 +5,7 @@ from unittest import main
 from unittest.mock import patch
 
 from shell_tools.dirs.search import find_empty_dirs
+from shell_tools.dirs.search import iter_files
 
 
 class SearchTestCase(TestCase):
@@ -47,6 +48,18 @@ class SearchTestCase(TestCase):
 
             self.assertEqual([], result)
 
+    def test_iter_files_yields_nested_regular_files(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            (root / "empty").mkdir()
+            (root / "nested").mkdir()
+            (root / "one").write_bytes(b"data")
+            (root / "nested" / "two").touch()
+
+            result = {path: stats.st_size for path, stats in iter_files(root)}
+
+            self.assertEqual({root / "one": 4, root / "nested" / "two": 0}, result)
+
 
 if __name__ == "__main__":
     main()
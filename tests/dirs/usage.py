@@ -0,0 +1,63 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest import main
+
+from shell_tools.dirs.usage import summarize_dir_usage
+
+
+class UsageTestCase(TestCase):
+    def test_summarize_dir_usage_aggregates_sizes_bottom_up(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            (root / "one" / "nested").mkdir(parents=True)
+            (root / "two").mkdir()
+            (root / "one" / "nested" / "file").write_bytes(b"x" * 100)
+            (root / "one" / "file").write_bytes(b"x" * 10)
+            (root / "two" / "file").write_bytes(b"x" * 1)
+
+            report = summarize_dir_usage(root, workers=4)
+
+            dirs_size = sum(path.stat().st_size for path in (root, root / "one", root / "one" / "nested", root / "two"))
+            self.assertEqual(111 + dirs_size, report.root.apparent_size)
+            self.assertEqual(3, report.root.files)
+            self.assertEqual(3, report.root.dirs)
+            self.assertEqual(0, report.errors)
+            self.assertEqual([], report.root.children)
+
+    def test_summarize_dir_usage_counts_hardlinks_once(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            original = root / "original"
+            original.write_bytes(b"x" * 1000)
+            (root / "link").hardlink_to(original)
+
+            report = summarize_dir_usage(root)
+
+            self.assertEqual(1000 + root.stat().st_size, report.root.apparent_size)
+            self.assertEqual(2, report.root.files)
+
+    def test_summarize_dir_usage_keeps_children_within_max_depth(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            (root / "one" / "nested" / "deep").mkdir(parents=True)
+
+            report = summarize_dir_usage(root, max_depth=1)
+
+            self.assertEqual([root / "one"], [child.path for child in report.root.children])
+            self.assertEqual([], report.root.children[0].children)
+
+    def test_summarize_dir_usage_collects_largest_subtrees(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            for name, size in (("small", 10), ("medium", 1000), ("large", 100_000)):
+                (root / name).mkdir()
+                (root / name / "file").write_bytes(b"x" * size)
+
+            report = summarize_dir_usage(root, top=2, apparent=True)
+
+            self.assertEqual([root / "large", root / "medium"], [usage.path for usage in report.largest])
+
+
+if __name__ == "__main__":
+    main()
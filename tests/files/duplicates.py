@@ -0,0 +1,86 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest import main
+
+from shell_tools.files.duplicates import EDGE_SIZE
+from shell_tools.files.duplicates import find_duplicate_files
+from shell_tools.files.duplicates import hash_edges
+from shell_tools.files.duplicates import hash_file
+
+
+class DuplicatesTestCase(TestCase):
+    def test_find_duplicate_files_groups_identical_small_files(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            (root / "nested").mkdir()
+            (root / "one").write_bytes(b"same data")
+            (root / "nested" / "two").write_bytes(b"same data")
+            (root / "other").write_bytes(b"diff data")
+            (root / "empty").touch()
+
+            report = find_duplicate_files(root)
+
+            self.assertEqual(1, len(report.groups))
+            self.assertEqual([root / "nested" / "two", root / "one"], report.groups[0].paths)
+            self.assertEqual(4, report.files_scanned)
+            self.assertEqual(27, report.bytes_scanned)
+            self.assertEqual(27, report.bytes_hashed)
+
+    def test_find_duplicate_files_fully_hashes_only_matching_edges(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            size = 4 * EDGE_SIZE
+            content = b"a" * size
+            middle_changed = b"a" * EDGE_SIZE + b"b" * (2 * EDGE_SIZE) + b"a" * EDGE_SIZE
+            head_changed = b"c" + b"a" * (size - 1)
+            (root / "one").write_bytes(content)
+            (root / "two").write_bytes(content)
+            (root / "three").write_bytes(middle_changed)
+            (root / "four").write_bytes(head_changed)
+
+            report = find_duplicate_files(root, workers=2)
+
+            self.assertEqual(1, len(report.groups))
+            self.assertEqual([root / "one", root / "two"], report.groups[0].paths)
+            self.assertEqual(4 * size, report.bytes_scanned)
+            self.assertEqual(4 * 2 * EDGE_SIZE + 3 * size, report.bytes_hashed)
+
+    def test_find_duplicate_files_reports_hardlinks_once(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            original = root / "original"
+            original.write_bytes(b"data")
+            (root / "link").hardlink_to(original)
+
+            report = find_duplicate_files(root)
+
+            self.assertEqual([], report.groups)
+
+    def test_find_duplicate_files_respects_min_size(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            root = Path(dir_name)
+            (root / "one").write_bytes(b"data")
+            (root / "two").write_bytes(b"data")
+
+            self.assertEqual(1, len(find_duplicate_files(root, min_size=4).groups))
+            self.assertEqual([], find_duplicate_files(root, min_size=5).groups)
+
+    def test_find_duplicate_files_returns_empty_report_for_missing_root(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            report = find_duplicate_files(Path(dir_name) / "missing")
+
+            self.assertEqual([], report.groups)
+            self.assertEqual(0, report.files_scanned)
+
+    def test_hash_file_matches_edges_hash_for_small_files(self) -> None:
+        with TemporaryDirectory() as dir_name:
+            path = Path(dir_name) / "file"
+            path.write_bytes(b"data")
+
+            self.assertEqual(hash_file(path), hash_edges(path, 4))
+            self.assertEqual(4, hash_file(path, chunk_size=1)[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,12 @@ from tempfile import TemporaryDirectory
 from typing import Any
 from unittest import TestCase
 from unittest import main
+from unittest.mock import patch
 
 from shell_tools.files.random import make_random_file
 from shell_tools.files.random import make_trash_string
 from shell_tools.files.random import write_random_data
+from shell_tools.timings import record
 
 
 def repeat_func(func: Callable[..., Any], times: int, *args: Any) -> Any:
@@ -35,6 +37,25 @@ class RandomTestCase(TestCase):
                 content = buffer.getvalue()
                 self.assertEqual(expected_size, len(content))
 
+    def test_write_random_data_records_generate_and_write_spans(self) -> None:
+        with patch("shell_tools.files.random.BATCH_SIZE", 64):
+            with StringIO() as buffer:
+                write_random_data(buffer, 100, 32)
+                untimed = buffer.getvalue()
+
+            with StringIO() as buffer, record() as timings:
+                write_random_data(buffer, 100, 32)
+                timed = buffer.getvalue()
+
+        self.assertEqual(100, len(timed))
+        self.assertEqual([32, 32, 32, 4], [len(line) for line in timed.splitlines(keepends=True)])
+        self.assertEqual(
+            [len(line) for line in untimed.splitlines(keepends=True)],
+            [len(line) for line in timed.splitlines(keepends=True)],
+        )
+        self.assertEqual(3, timings.spans["generate"].calls)
+        self.assertEqual(3, timings.spans["write"].calls)
+
     def test_make_random_file(self) -> None:
         with TemporaryDirectory() as dir_name:
             root = Path(dir_name)
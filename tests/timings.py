@@ -0,0 +1,42 @@
+from unittest import TestCase
+from unittest import main
+
+from shell_tools.timings import count
+from shell_tools.timings import record
+from shell_tools.timings import span
+
+
+class TimingsTestCase(TestCase):
+    def test_span_and_count_are_no_ops_without_recorder(self) -> None:
+        with span("phase"):
+            count("operations")
+
+        with record() as timings:
+            pass
+
+        self.assertEqual({}, timings.spans)
+        self.assertEqual({}, timings.counters)
+
+    def test_record_collects_spans_and_counters(self) -> None:
+        with record() as timings:
+            phase = span("phase")
+            for _ in range(3):
+                with phase:
+                    count("operations", 2)
+
+        self.assertEqual(3, timings.spans["phase"].calls)
+        self.assertGreaterEqual(timings.spans["phase"].wall, 0.0)
+        self.assertEqual({"operations": 6}, timings.counters)
+
+    def test_record_restores_previous_recorder(self) -> None:
+        with record() as outer:
+            with record() as inner:
+                count("inner")
+            count("outer")
+
+        self.assertEqual({"inner": 1}, inner.counters)
+        self.assertEqual({"outer": 1}, outer.counters)
+
+
+if __name__ == "__main__":
+    main()